@@ -1,30 +1,130 @@
-import matplotlib.pyplot as plt
+import math
 
-def generate_circular_square_map(size):
+import numpy as np
+
+def generate_circular_square_map(size, return_as="set"):
+    # return_as selects the output layout:
+    #   "set"    - set of (x, y) tuples
+    #   "coords" - (N, 2) int16 array of (x, y) pairs
+    #   "bitmap" - (size, size) uint8 grid indexed [y, x], 1 for map tiles
+    #   "packed" - the bitmap flattened row-major and bit-packed with np.packbits,
+    #              ceil(size * size / 8) bytes; query it with contains()
+    radius = size // 2
+
+    # Distances of every tile from the center, computed as whole arrays
+    ys, xs = np.ogrid[:size, :size]
+    dx = np.abs(xs - radius)
+    dy = np.abs(ys - radius)
+
+    # Manhattan distance
+    manhattan_distance = dx + dy
+
+    # A tile is included when int(0.6 * manhattan + 0.4 * euclidean) <= radius + 3,
+    # i.e. 6 * manhattan + 4 * euclidean < 10 * (radius + 4). Manhattan is an integer,
+    # so only the euclidean term needs truncating and the comparison stays integral.
+    limit = 10 * (radius + 4)
+    scaled_manhattan = 6 * manhattan_distance
+
+    # euclidean <= manhattan, so tiles with manhattan < radius + 4 are always in.
+    # euclidean >= manhattan / sqrt(2), so int(4 * euclidean) >= isqrt(8 * manhattan**2)
+    # and tiles with 6 * manhattan + isqrt(8 * manhattan**2) >= limit are always out.
+    # Only the band in between needs the per-tile euclidean distance.
+    min_scaled_euclidean = np.array([math.isqrt(8 * m * m) for m in range(2 * radius + 1)], dtype=np.int64)
+    mask = manhattan_distance < radius + 4
+    band = ~mask & (scaled_manhattan + min_scaled_euclidean[manhattan_distance] < limit)
+    squared = (dx * dx + dy * dy)[band]
+    # Euclidean distance
+    euclidean_distance = np.sqrt(squared)
+    mask[band] = scaled_manhattan[band] + (4 * euclidean_distance).astype(np.int32) < limit
+
+    return _format_map(mask, size, return_as)
+
+def _format_map(mask, size, return_as):
+    # Converts a boolean (size, size) mask indexed [y, x] into the requested return_as layout
+    if return_as == "packed":
+        return np.packbits(mask.ravel())
+    if return_as == "bitmap":
+        grid = np.zeros((size, size), dtype=np.uint8)
+        grid[mask] = 1
+        return grid
+
+    # mask is indexed [y, x]; transpose so argwhere yields (x, y) pairs
+    coords = np.argwhere(mask.T)
+    if return_as == "coords":
+        return coords.astype(np.int16)
+    if return_as == "set":
+        return set(map(tuple, coords.tolist()))
+    raise ValueError(f"Unknown return_as: {return_as!r}")
+
+def contains(bitmap, x, y, size):
+    # Tests whether tile (x, y) is set in a bitmap from return_as="packed".
+    # Packed maps of the same size can be combined with np.bitwise_and / np.bitwise_or.
+    # Off-map tiles are reported as 0, like a missing (x, y) in the "set" layout.
+    if not (0 <= x < size and 0 <= y < size):
+        return 0
+    idx = y * size + x
+    return (bitmap[idx >> 3] >> (7 - (idx & 7))) & 1
+
+def fill_map(size, out):
+    # Same tile rule as generate_circular_square_map, fused into one loop.
+    # out is a (size, size) uint8 grid indexed [y, x].
+    # Written for numba; see _compiled_fill_map. Run as plain Python it is much slower
+    # than the vectorized generate_circular_square_map.
     radius = size // 2
-    center = (radius, radius)
-    coordinates = set()
-
-    for x in range(size):
-        for y in range(size):
-            dx = abs(x - center[0])
-            dy = abs(y - center[1])
-            
-            # Manhattan distance
+    limit = 10 * (radius + 4)
+    # Lower bound of int(4 * euclidean) per manhattan distance: isqrt(8 * m * m).
+    # numba has no math.isqrt; 8 * m * m is never a perfect square for m > 0, so the
+    # floored float sqrt is exact here.
+    min_scaled_euclidean = np.empty(2 * radius + 1, dtype=np.int64)
+    for m in range(2 * radius + 1):
+        min_scaled_euclidean[m] = int(math.sqrt(8.0 * m * m))
+    for y in range(size):
+        dy = abs(y - radius)
+        for x in range(size):
+            dx = abs(x - radius)
             manhattan_distance = dx + dy
-            # Euclidean distance
-            euclidean_distance = (dx**2 + dy**2) ** 0.5
-            
-            weight = 0.6
-            effective_distance = weight * manhattan_distance + (1 - weight) * euclidean_distance
-            
-            # Use an integer comparison for including a tile
-            if int(effective_distance) <= radius + 3:
-                coordinates.add((x , y ))  # Shift coordinates by 0.5 units
-    
-    return coordinates
+            # Decide on the manhattan distance alone where it is conclusive
+            if manhattan_distance < radius + 4:
+                out[y, x] = 1
+                continue
+            if 6 * manhattan_distance + min_scaled_euclidean[manhattan_distance] >= limit:
+                out[y, x] = 0
+                continue
+            euclidean_distance = math.sqrt(dx * dx + dy * dy)
+            scaled_distance = 6 * manhattan_distance + int(4 * euclidean_distance)
+            out[y, x] = 1 if scaled_distance < limit else 0
+    return out
+
+_fill_map_jit = None
+
+def _compiled_fill_map():
+    # Compiles fill_map with numba on first use (the machine code is cached on disk
+    # across runs), so importing this module stays cheap. Returns None without numba;
+    # a failed import is remembered as False so it is only attempted once.
+    global _fill_map_jit
+    if _fill_map_jit is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _fill_map_jit = False
+        else:
+            _fill_map_jit = njit(cache=True, boundscheck=False)(fill_map)
+    return None if _fill_map_jit is False else _fill_map_jit
+
+def generate_circular_square_map_array(size, return_as="coords"):
+    # Same outputs as generate_circular_square_map (return_as defaults to the (N, 2)
+    # int16 coordinate array), using the numba-compiled fill_map. Without numba this
+    # is just the vectorized generate_circular_square_map, not a compiled path.
+    jit_fill_map = _compiled_fill_map()
+    if jit_fill_map is None:
+        return generate_circular_square_map(size, return_as=return_as)
+    grid = jit_fill_map(size, np.empty((size, size), dtype=np.uint8))
+    return _format_map(grid.astype(bool), size, return_as)
 
 def visualize_coordinates(coordinates, size):
+    # Imported here so that using this module as a library doesn't pay for matplotlib
+    import matplotlib.pyplot as plt
+
     # Create a grid filled with zeros.
     grid = [[0 for _ in range(size)] for _ in range(size)]
     for x, y in coordinates:
@@ -43,7 +143,8 @@ def visualize_coordinates(coordinates, size):
     plt.show()
 
 # Example usage:
-map_size = 29
-coordinates = generate_circular_square_map(map_size)
-print(coordinates)
-visualize_coordinates(coordinates, map_size)
+if __name__ == "__main__":
+    map_size = 29
+    coordinates = generate_circular_square_map(map_size)
+    print(coordinates)
+    visualize_coordinates(coordinates, map_size)
@@ -0,0 +1,126 @@
+# tests/conftest.py
+
+import orjson
+import pytest
+import pytest_asyncio
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+from solana.rpc.async_api import AsyncClient
+from anchorpy import Program, Provider, Wallet, Idl
+from solana.rpc.commitment import Confirmed, Processed
+from solana.rpc.types import TxOpts
+
+PROGRAM_ID = Pubkey.from_string("FE7WJhRY55XjHcR22ryA3tHLq6fkDNgZBpbh25tto67Q")
+IDL_PATH = "target/idl/middle_earth_ai_program.json"
+RPC_URL = "http://127.0.0.1:8899"
+AIRDROP_LAMPORTS = 10_000_000_000
+
+GAME_ID = 1
+AGENT_IDS = (1, 2)
+
+# PDA seed components
+GAME_SEED = b"game"
+AGENT_SEED = b"agent"
+GAME_ID_LE = GAME_ID.to_bytes(4, "little")
+AGENT_ID_BYTES = tuple(bytes([i]) for i in range(256))
+
+# test_resolve_battle.py is a mocha/TypeScript suite and test_middle_earth.py is a
+# standalone script that reads ../target at import; neither is a pytest module.
+collect_ignore = ["test_resolve_battle.py", "test_middle_earth.py"]
+
+@pytest.fixture(scope="session")
+def pdas():
+    """
+    Derives the game and agent PDAs once for the whole test run.
+    Keys are (game_id, agent_id); the game PDA itself is stored under (game_id, None).
+    Values are (pda, bump) tuples.
+    """
+    game_pda, game_bump = Pubkey.find_program_address(
+        [GAME_SEED, GAME_ID_LE],
+        PROGRAM_ID
+    )
+    cache = {(GAME_ID, None): (game_pda, game_bump)}
+    for agent_id in AGENT_IDS:
+        cache[(GAME_ID, agent_id)] = Pubkey.find_program_address(
+            [AGENT_SEED, bytes(game_pda), AGENT_ID_BYTES[agent_id]],
+            PROGRAM_ID
+        )
+    return cache
+
+@pytest.fixture(scope="session")
+def game_id():
+    """Id of the shared test game."""
+    return GAME_ID
+
+@pytest.fixture(scope="session")
+def game_pda(pdas):
+    """PDA of the shared test game."""
+    return pdas[(GAME_ID, None)][0]
+
+@pytest.fixture(scope="session")
+def game_bump(pdas):
+    """Bump seed of the shared test game PDA."""
+    return pdas[(GAME_ID, None)][1]
+
+@pytest.fixture(scope="session")
+def make_agent_pda(pdas, game_pda):
+    """Returns a helper mapping an agent id to its PDA in the shared test game."""
+    def make(agent_id):
+        key = (GAME_ID, agent_id)
+        if key not in pdas:
+            pdas[key] = Pubkey.find_program_address(
+                [AGENT_SEED, bytes(game_pda), AGENT_ID_BYTES[agent_id]],
+                PROGRAM_ID
+            )
+        return pdas[key][0]
+    return make
+
+@pytest.fixture(scope="session")
+def final_tx_opts():
+    """Options for the last transaction of a test, which waits for confirmed commitment."""
+    return TxOpts(skip_confirmation=False, skip_preflight=True, preflight_commitment=Confirmed)
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def connection():
+    """One AsyncClient connection reused by every test."""
+    client = AsyncClient(RPC_URL)
+    yield client
+    await client.close()
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def payer(connection):
+    """A single payer for the whole run, funded with one airdrop."""
+    kp = Keypair()
+    resp = await connection.request_airdrop(kp.pubkey(), AIRDROP_LAMPORTS)
+    await connection.confirm_transaction(resp.value, Processed)
+    return kp
+
+@pytest.fixture(scope="session")
+def idl():
+    """
+    Parses the IDL once per test session.
+    Loaded lazily so tests that don't need the built program can run without target/.
+    """
+    with open(IDL_PATH, "rb") as f:
+        raw_idl = orjson.loads(f.read())
+    return Idl.from_json(raw_idl)
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def program(idl, connection, payer):
+    """
+    Builds the Program once per test session.
+    Transactions are confirmed before returning: setup ones at processed commitment,
+    while tests opt into confirmed (final_tx_opts) for the transaction they assert on.
+    """
+    wallet = Wallet(payer)
+    provider = Provider(
+        connection,
+        wallet,
+        opts=TxOpts(skip_confirmation=False, skip_preflight=True, preflight_commitment=Processed),
+    )
+    return Program(idl, PROGRAM_ID, provider)
+
+@pytest.fixture(scope="session")
+def agent_account(program):
+    """The "agent" AccountClient, resolved once instead of on every fetch."""
+    return program.account["agent"]
@@ -1,44 +1,17 @@
 # tests/test_agent.py
 
 import pytest
-import json
-from solana.keypair import Keypair
-from solana.publickey import PublicKey
-from solana.rpc.async_api import AsyncClient
-from anchorpy import Program, Provider, Wallet, Idl, Context
-from solana.rpc.types import TxOpts
+from solders.system_program import ID as SYSTEM_PROGRAM_ID
+from anchorpy import Context
+from solana.rpc.commitment import Confirmed, Processed
 
-PROGRAM_ID = PublicKey("FE7WJhRY55XjHcR22ryA3tHLq6fkDNgZBpbh25tto67Q")
-IDL_PATH = "target/idl/middle_earth_ai_program.json"
-
-GAME_ID = 1
 AGENT_ID = 1
 
-@pytest.mark.asyncio
-async def test_register_agent_and_kill():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_register_agent_and_kill(program, agent_account, payer, game_pda, make_agent_pda, final_tx_opts):
     """Tests register_agent and kill_agent instructions."""
-    with open(IDL_PATH, "r") as f:
-        raw_idl = json.load(f)
-    idl = Idl.from_json(raw_idl)
-
-    connection = AsyncClient("http://127.0.0.1:8899")
-    payer = Keypair.generate()
-    wallet = Wallet(payer)
-    provider = Provider(connection, wallet, opts=TxOpts(skip_preflight=True))
-    program = Program(idl, PROGRAM_ID, provider)
-
-    # Derive the Game PDA (assume game is already initialized)
-    game_id_bytes = GAME_ID.to_bytes(4, "little")
-    [game_pda, game_bump] = PublicKey.find_program_address(
-        [b"game", game_id_bytes],
-        PROGRAM_ID
-    )
-
-    # Derive the Agent PDA
-    [agent_pda, agent_bump] = PublicKey.find_program_address(
-        [b"agent", game_pda.to_bytes(), bytes([AGENT_ID])],
-        PROGRAM_ID
-    )
+    # The game is assumed to be already initialized
+    agent_pda = make_agent_pda(AGENT_ID)
     print("Derived agent PDA:", agent_pda)
 
     # Register the agent
@@ -49,8 +22,8 @@ async def test_register_agent_and_kill():
                 accounts={
                     "game": game_pda,
                     "agent": agent_pda,
-                    "authority": payer.public_key,
-                    "system_program": PublicKey("11111111111111111111111111111111"),
+                    "authority": payer.pubkey(),
+                    "system_program": SYSTEM_PROGRAM_ID,
                 },
                 signers=[payer]
             )
@@ -60,7 +33,7 @@ async def test_register_agent_and_kill():
         pytest.fail(f"register_agent failed: {e}")
 
     # Fetch agent data
-    agent_data = await program.account["agent"].fetch(agent_pda)
+    agent_data = await agent_account.fetch(agent_pda, commitment=Processed)
     print("Agent data after register:", agent_data)
     assert agent_data["isAlive"] == True, "Agent should be alive"
 
@@ -70,9 +43,10 @@ async def test_register_agent_and_kill():
             ctx=Context(
                 accounts={
                     "agent": agent_pda,
-                    "authority": payer.public_key,
+                    "authority": payer.pubkey(),
                 },
-                signers=[payer]
+                signers=[payer],
+                options=final_tx_opts,
             )
         )
         print("kill_agent tx:", tx_sig_kill)
@@ -80,9 +54,8 @@ async def test_register_agent_and_kill():
         pytest.fail(f"kill_agent failed: {e}")
 
     # Verify agent is dead
-    agent_data_killed = await program.account["agent"].fetch(agent_pda)
+    agent_data_killed = await agent_account.fetch(agent_pda, commitment=Confirmed)
     print("Agent data after kill:", agent_data_killed)
     assert agent_data_killed["isAlive"] == False, "Agent should be dead"
 
-    await connection.close()
     print("test_register_agent_and_kill passed!")
@@ -1,48 +1,17 @@
 # tests/test_battle.py
 
 import pytest
-import json
-from solana.keypair import Keypair
-from solana.publickey import PublicKey
-from solana.rpc.async_api import AsyncClient
-from anchorpy import Program, Provider, Wallet, Idl, Context
-from solana.rpc.types import TxOpts
+from anchorpy import Context
+from solana.rpc.commitment import Confirmed
 
-PROGRAM_ID = PublicKey("FE7WJhRY55XjHcR22ryA3tHLq6fkDNgZBpbh25tto67Q")
-IDL_PATH = "target/idl/middle_earth_ai_program.json"
-
-GAME_ID = 1
-
-@pytest.mark.asyncio
-async def test_resolve_battle_simple():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_resolve_battle_simple(program, agent_account, payer, game_pda, make_agent_pda, final_tx_opts):
     """Tests resolve_battle_simple (no alliances)."""
-    with open(IDL_PATH, "r") as f:
-        raw_idl = json.load(f)
-    idl = Idl.from_json(raw_idl)
-
-    connection = AsyncClient("http://127.0.0.1:8899")
-    payer = Keypair.generate()
-    wallet = Wallet(payer)
-    provider = Provider(connection, wallet, opts=TxOpts(skip_preflight=True))
-    program = Program(idl, PROGRAM_ID, provider)
-
-    # Derive the Game PDA
-    [game_pda, game_bump] = PublicKey.find_program_address(
-        [b"game", GAME_ID.to_bytes(4, "little")],
-        PROGRAM_ID
-    )
-
     # Suppose we have 2 agents: agent1 & agent2, no alliances
     agent_id_1 = 1
     agent_id_2 = 2
-    agent_pda_1, _ = PublicKey.find_program_address(
-        [b"agent", game_pda.to_bytes(), bytes([agent_id_1])],
-        PROGRAM_ID
-    )
-    agent_pda_2, _ = PublicKey.find_program_address(
-        [b"agent", game_pda.to_bytes(), bytes([agent_id_2])],
-        PROGRAM_ID
-    )
+    agent_pda_1 = make_agent_pda(agent_id_1)
+    agent_pda_2 = make_agent_pda(agent_id_2)
 
     # We call resolve_battle_simple(winner, loser, transfer_amount=someValue).
     # The IDL for resolve_battle_simple: (transfer_amount) -> accounts: winner, loser, game, authority
@@ -56,9 +25,10 @@ async def test_resolve_battle_simple():
                     "winner": agent_pda_1,
                     "loser": agent_pda_2,
                     "game": game_pda,
-                    "authority": payer.public_key,
+                    "authority": payer.pubkey(),
                 },
-                signers=[payer]
+                signers=[payer],
+                options=final_tx_opts,
             )
         )
         print("resolve_battle_simple tx:", tx_sig)
@@ -66,11 +36,13 @@ async def test_resolve_battle_simple():
         pytest.fail(f"resolve_battle_simple failed: {e}")
 
     # Check cooldown updates
-    agent1_data = await program.account["agent"].fetch(agent_pda_1)
-    agent2_data = await program.account["agent"].fetch(agent_pda_2)
+    agent1_data, agent2_data = await agent_account.fetch_multiple(
+        [agent_pda_1, agent_pda_2], commitment=Confirmed
+    )
+    assert agent1_data is not None, "Agent1 account not found"
+    assert agent2_data is not None, "Agent2 account not found"
     print("Agent1 after battle simple:", agent1_data)
     print("Agent2 after battle simple:", agent2_data)
     # Both should have updated last_attack to the current timestamp
 
-    await connection.close()
     print("test_resolve_battle_simple passed!")
@@ -1,41 +1,16 @@
 # tests/test_ignore.py
 
 import pytest
-import json
-from solana.keypair import Keypair
-from solana.publickey import PublicKey
-from solana.rpc.async_api import AsyncClient
-from anchorpy import Program, Provider, Wallet, Idl, Context
-from solana.rpc.types import TxOpts
+from anchorpy import Context
+from solana.rpc.commitment import Confirmed
 
-PROGRAM_ID = PublicKey("FE7WJhRY55XjHcR22ryA3tHLq6fkDNgZBpbh25tto67Q")
-IDL_PATH = "target/idl/middle_earth_ai_program.json"
-
-GAME_ID = 1
 AGENT_ID = 1
 TARGET_IGNORE_ID = 2
 
-@pytest.mark.asyncio
-async def test_ignore_agent():
-    with open(IDL_PATH, "r") as f:
-        raw_idl = json.load(f)
-    idl = Idl.from_json(raw_idl)
-
-    connection = AsyncClient("http://127.0.0.1:8899")
-    payer = Keypair.generate()
-    wallet = Wallet(payer)
-    provider = Provider(connection, wallet, opts=TxOpts(skip_preflight=True))
-    program = Program(idl, PROGRAM_ID, provider)
-
-    # Derive game + agent PDAs (assuming agent is reg'd).
-    game_pda, _ = PublicKey.find_program_address(
-        [b"game", GAME_ID.to_bytes(4, "little")],
-        PROGRAM_ID
-    )
-    agent_pda, _ = PublicKey.find_program_address(
-        [b"agent", game_pda.to_bytes(), bytes([AGENT_ID])],
-        PROGRAM_ID
-    )
+@pytest.mark.asyncio(loop_scope="session")
+async def test_ignore_agent(program, agent_account, payer, game_pda, make_agent_pda, final_tx_opts):
+    # Assumes the agent is already registered.
+    agent_pda = make_agent_pda(AGENT_ID)
 
     # ignore_agent instruction: (target_agent_id: u8)
     # Accounts: agent, game, authority
@@ -46,9 +21,10 @@ async def test_ignore_agent():
                 accounts={
                     "agent": agent_pda,
                     "game": game_pda,
-                    "authority": payer.public_key,
+                    "authority": payer.pubkey(),
                 },
-                signers=[payer]
+                signers=[payer],
+                options=final_tx_opts,
             )
         )
         print("ignore_agent tx:", tx_sig)
@@ -56,7 +32,7 @@ async def test_ignore_agent():
         pytest.fail(f"ignore_agent failed: {e}")
 
     # Check that the agent's ignore_cooldowns was updated
-    agent_data = await program.account["agent"].fetch(agent_pda)
+    agent_data = await agent_account.fetch(agent_pda, commitment=Confirmed)
     print("Agent data after ignore_agent:", agent_data)
 
     # The last entry in ignore_cooldowns should have agent_id = TARGET_IGNORE_ID
@@ -64,5 +40,4 @@ async def test_ignore_agent():
     assert len(ignore_list) > 0, "ignore_cooldowns should not be empty"
     assert ignore_list[-1]["agentId"] == TARGET_IGNORE_ID, "Should match the target ignored ID"
 
-    await connection.close()
     print("test_ignore_agent passed!")
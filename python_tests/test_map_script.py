@@ -0,0 +1,86 @@
+# tests/test_map_script.py
+
+import numpy as np
+import pytest
+
+from map_script import (
+    contains,
+    fill_map,
+    generate_circular_square_map,
+    generate_circular_square_map_array,
+)
+
+SIZES = list(range(0, 64)) + [99, 100, 128, 199]
+
+def reference_map(size):
+    """The original scalar tile rule, used as the source of truth."""
+    radius = size // 2
+    coordinates = set()
+    for x in range(size):
+        for y in range(size):
+            dx = abs(x - radius)
+            dy = abs(y - radius)
+            manhattan_distance = dx + dy
+            euclidean_distance = (dx**2 + dy**2) ** 0.5
+            effective_distance = 0.6 * manhattan_distance + 0.4 * euclidean_distance
+            if int(effective_distance) <= radius + 3:
+                coordinates.add((x, y))
+    return coordinates
+
+@pytest.mark.parametrize("size", SIZES)
+def test_set_matches_reference_rule(size):
+    """The default "set" output matches the original scalar rule."""
+    assert generate_circular_square_map(size) == reference_map(size)
+
+@pytest.mark.parametrize("size", SIZES)
+def test_fill_map_matches_numpy(size):
+    """fill_map (plain and via the Numba wrapper) yields the same grid as the NumPy path."""
+    bitmap = generate_circular_square_map(size, return_as="bitmap")
+    grid = fill_map(size, np.empty((size, size), dtype=np.uint8))
+    assert np.array_equal(grid, bitmap)
+    assert np.array_equal(
+        generate_circular_square_map_array(size, return_as="bitmap"), bitmap
+    )
+    assert np.array_equal(
+        generate_circular_square_map_array(size),
+        generate_circular_square_map(size, return_as="coords"),
+    )
+
+def test_output_layouts():
+    """coords, bitmap and packed have the expected shapes and dtypes."""
+    size = 29
+    tiles = generate_circular_square_map(size)
+
+    coords = generate_circular_square_map(size, return_as="coords")
+    assert coords.shape == (len(tiles), 2)
+    assert coords.dtype == np.int16
+    assert set(map(tuple, coords.tolist())) == tiles
+
+    bitmap = generate_circular_square_map(size, return_as="bitmap")
+    assert bitmap.shape == (size, size)
+    assert bitmap.dtype == np.uint8
+    assert {(int(x), int(y)) for y, x in np.argwhere(bitmap)} == tiles
+
+    packed = generate_circular_square_map(size, return_as="packed")
+    assert packed.shape == (-(-size * size // 8),)
+    assert packed.dtype == np.uint8
+
+def test_contains_matches_bitmap():
+    """contains() on the packed map agrees with the bitmap for every tile, and is 0 off the map."""
+    size = 29
+    tiles = generate_circular_square_map(size)
+    bitmap = generate_circular_square_map(size, return_as="bitmap")
+    packed = generate_circular_square_map(size, return_as="packed")
+    for y in range(size):
+        for x in range(size):
+            assert contains(packed, x, y, size) == bitmap[y, x]
+
+    # Off-map coordinates must not wrap into a neighbouring row or index past the end
+    for x, y in [(size, 14), (-1, 14), (14, size), (14, -1), (100, 200)]:
+        assert contains(packed, x, y, size) == 0
+        assert (x, y) not in tiles
+
+def test_unknown_return_as_raises():
+    """An unknown return_as is rejected."""
+    with pytest.raises(ValueError):
+        generate_circular_square_map(29, return_as="list")
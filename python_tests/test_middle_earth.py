@@ -3,7 +3,8 @@ import os
 from solders.keypair import Keypair
 from solana.rpc.async_api import AsyncClient
 from anchorpy import Provider, Wallet, Program, Context
-from solders.pubkey import Pubkey as PublicKey
+from solders.pubkey import Pubkey
+from solders.system_program import ID as SYSTEM_PROGRAM_ID
 from solana.rpc.types import TxOpts
 
 # 1) Load the IDL JSON (paste that JSON in an `idl.json` file).
@@ -11,7 +12,13 @@ with open("../target/idl/middle_earth_ai_program.json", "r") as f:
     idl_json = json.load(f)
 
 # 2) Program ID from your IDL or Anchor.toml
-PROGRAM_ID = PublicKey.from_string("FE7WJhRY55XjHcR22ryA3tHLq6fkDNgZBpbh25tto67Q")
+PROGRAM_ID = Pubkey.from_string("FE7WJhRY55XjHcR22ryA3tHLq6fkDNgZBpbh25tto67Q")
+
+# PDA seed prefixes
+GAME_SEED_PREFIX = b"game"
+AGENT_SEED_PREFIX = b"agent"
+# One-byte agent id seeds, indexed by agent id
+AGENT_ID_BYTES = tuple(bytes([i]) for i in range(256))
 
 # 3) Create a local provider. 
 #    If using a local validator, set "http://127.0.0.1:8899" or use devnet if you like.
@@ -35,9 +42,8 @@ async def main():
     # Derive the game PDA (the same seeds in your code: ["game", game_id.to_le_bytes()])
     # If you manually want to find the PDA:
     from anchorpy import utils
-    GAME_SEED_PREFIX = b"game"
     seeds = [GAME_SEED_PREFIX, game_id.to_bytes(4, "little")]
-    game_pda, game_bump = PublicKey.find_program_address(seeds, PROGRAM_ID)
+    game_pda, game_bump = Pubkey.find_program_address(seeds, PROGRAM_ID)
     
     print("Derived game_pda =", game_pda, "with bump =", game_bump)
 
@@ -49,8 +55,8 @@ async def main():
         ctx=Context(
             accounts={
                 "game": game_pda,
-                "authority": authority_kp.public_key,
-                "system_program": PublicKey("11111111111111111111111111111111"),
+                "authority": authority_kp.pubkey(),
+                "system_program": SYSTEM_PROGRAM_ID,
             },
             signers=[authority_kp],  # The authority who pays the init cost
         ),
@@ -63,11 +69,11 @@ async def main():
 
     agent_id = 7
     agent_seeds = [
-        b"agent",
+        AGENT_SEED_PREFIX,
         bytes(game_pda),
-        bytes([agent_id])
+        AGENT_ID_BYTES[agent_id]
     ]
-    agent_pda, agent_bump = PublicKey.find_program_address(agent_seeds, PROGRAM_ID)
+    agent_pda, agent_bump = Pubkey.find_program_address(agent_seeds, PROGRAM_ID)
     
     print("Derived agent_pda =", agent_pda, "with bump =", agent_bump)
 
@@ -86,8 +92,8 @@ async def main():
             accounts={
                 "game": game_pda,
                 "agent": agent_pda,
-                "authority": authority_kp.public_key,
-                "system_program": PublicKey("11111111111111111111111111111111"),
+                "authority": authority_kp.pubkey(),
+                "system_program": SYSTEM_PROGRAM_ID,
             },
             signers=[authority_kp]
         ),
@@ -100,7 +106,7 @@ async def main():
         ctx=Context(
             accounts={
                 "agent": agent_pda,
-                "authority": authority_kp.public_key,
+                "authority": authority_kp.pubkey(),
             },
             signers=[authority_kp]
         ),
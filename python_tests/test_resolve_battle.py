@@ -52,37 +52,37 @@ describe("resolve_battle_simple", () => {
       })
       .rpc();
 
-    // Register the winner agent.
-    await program.methods
-      .registerAgent(
-        AGENT_ID_WINNER,
-        /* x: */ 0,
-        /* y: */ 0,
-        "Winner"
-      )
-      .accounts({
-        game: gamePda,
-        agent: winnerPda,
-        authority: wallet.publicKey,
-        systemProgram: anchor.web3.SystemProgram.programId,
-      })
-      .rpc();
-
-    // Register the loser agent.
-    await program.methods
-      .registerAgent(
-        AGENT_ID_LOSER,
-        /* x: */ 1,
-        /* y: */ 1,
-        "Loser"
-      )
-      .accounts({
-        game: gamePda,
-        agent: loserPda,
-        authority: wallet.publicKey,
-        systemProgram: anchor.web3.SystemProgram.programId,
-      })
-      .rpc();
+    // Register both agents concurrently; the two transactions are independent.
+    await Promise.all([
+      program.methods
+        .registerAgent(
+          AGENT_ID_WINNER,
+          /* x: */ 0,
+          /* y: */ 0,
+          "Winner"
+        )
+        .accounts({
+          game: gamePda,
+          agent: winnerPda,
+          authority: wallet.publicKey,
+          systemProgram: anchor.web3.SystemProgram.programId,
+        })
+        .rpc(),
+      program.methods
+        .registerAgent(
+          AGENT_ID_LOSER,
+          /* x: */ 1,
+          /* y: */ 1,
+          "Loser"
+        )
+        .accounts({
+          game: gamePda,
+          agent: loserPda,
+          authority: wallet.publicKey,
+          systemProgram: anchor.web3.SystemProgram.programId,
+        })
+        .rpc(),
+    ]);
   });
 
   it("should resolve a battle between two agents", async () => {
@@ -100,8 +100,10 @@ describe("resolve_battle_simple", () => {
       .rpc();
 
     // Fetch updated accounts to verify changes.
-    const winnerAccount = await program.account.agent.fetch(winnerPda);
-    const loserAccount = await program.account.agent.fetch(loserPda);
+    const [winnerAccount, loserAccount] = await Promise.all([
+      program.account.agent.fetch(winnerPda),
+      program.account.agent.fetch(loserPda),
+    ]);
 
     // Verify that the lastAttack field is updated (assuming your IDL defines it as last_attack)
     assert.ok(